@@ -1,5 +1,8 @@
 """The IQAir Cloud integration."""
 from __future__ import annotations
+import asyncio
+from collections.abc import Callable
+from functools import partial
 from typing import Any
 
 import httpx
@@ -10,7 +13,12 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .api import IQAirApiClient
+from .api import (
+    IQAirApiClient,
+    async_prepare_ssl_context,
+    create_command_client,
+    create_state_client,
+)
 from .const import (
     DOMAIN,
     CONF_LOGIN_TOKEN,
@@ -21,9 +29,9 @@ from .const import (
     CONF_DEVICE_PREFIX,
     DEFAULT_API_ENDPOINT,
     DEFAULT_DEVICE_PREFIX,
-    GRPC_API_HEADERS,
+    SHARED_CLIENTS,
 )
-from .coordinator import IQAirDataUpdateCoordinator
+from .coordinator import IQAirDataUpdateCoordinator, IQAirRuntimeData
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,9 +42,66 @@ PLATFORMS: list[Platform] = [
 ]
 
 
+def _get_or_create_shared_clients(
+    hass: HomeAssistant, entry_id: str, auth_token: str, login_token: str
+) -> tuple[Callable[[], httpx.AsyncClient], httpx.AsyncClient]:
+    """Return the httpx clients for a token pair, creating them on first use.
+
+    Entries sharing the same tokens reuse one pair of clients (and therefore one
+    set of connection pools). Each entry is recorded as a holder so the clients
+    are only closed once the last entry using them is unloaded.
+
+    The command client is returned as a factory: most of the time nothing is
+    sent to the device, so its HTTP/2 connection is only opened on first use.
+    """
+    shared_clients = hass.data.setdefault(DOMAIN, {}).setdefault(SHARED_CLIENTS, {})
+    key = (auth_token, login_token)
+
+    if (shared := shared_clients.get(key)) is None:
+        shared = shared_clients[key] = {
+            "command_client": None,
+            "state_client": create_state_client(login_token),
+            "holders": set(),
+        }
+
+    def _get_command_client() -> httpx.AsyncClient:
+        """Return the shared command client, creating it if needed."""
+        if shared["command_client"] is None:
+            shared["command_client"] = create_command_client(auth_token)
+        return shared["command_client"]
+
+    shared["holders"].add(entry_id)
+    return _get_command_client, shared["state_client"]
+
+
+async def async_release_shared_clients(
+    hass: HomeAssistant, entry_id: str, auth_token: str, login_token: str
+) -> None:
+    """Release a holder's hold on its shared clients, closing them if unused."""
+    shared_clients = hass.data.get(DOMAIN, {}).get(SHARED_CLIENTS, {})
+    key = (auth_token, login_token)
+    if (shared := shared_clients.get(key)) is None:
+        return
+
+    shared["holders"].discard(entry_id)
+    if shared["holders"]:
+        return
+
+    del shared_clients[key]
+    clients = [
+        client
+        for client in (shared["command_client"], shared["state_client"])
+        if client is not None
+    ]
+    # Close concurrently, and shielded so a cancelled unload can't leave
+    # half-closed connections behind
+    await asyncio.shield(
+        asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+    )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up IQAir Cloud from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
     login_token = entry.data[CONF_LOGIN_TOKEN]
     user_id = entry.data[CONF_USER_ID]
     auth_token = entry.data[CONF_AUTH_TOKEN]
@@ -46,57 +111,53 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     api_endpoint = entry.options.get(CONF_API_ENDPOINT, DEFAULT_API_ENDPOINT)
     device_prefix = entry.options.get(CONF_DEVICE_PREFIX, DEFAULT_DEVICE_PREFIX)
 
-    def _create_clients() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
-        """Create the httpx clients in a thread-safe way."""
-        command_client = httpx.AsyncClient(
-            http2=True,
-            headers={**GRPC_API_HEADERS, "Authorization": f"Bearer {auth_token}"},
-        )
-        state_client = httpx.AsyncClient(headers={"x-login-token": login_token})
-        return command_client, state_client
-
-    command_client, state_client = await hass.async_add_executor_job(_create_clients)
-
-    api_client = IQAirApiClient(
-        command_client=command_client,
-        state_client=state_client,
-        user_id=user_id,
-        serial_number=serial_number,
-        endpoint=api_endpoint,
-        device_prefix=device_prefix,
+    await async_prepare_ssl_context(hass)
+    command_client_factory, state_client = _get_or_create_shared_clients(
+        hass, entry.entry_id, auth_token, login_token
     )
 
-    coordinator = IQAirDataUpdateCoordinator(
-        hass, api=api_client, device_id=entry.data["device_id"]
+    # Register before anything that can fail so the clients are always released.
+    # A partial rather than a closure, so the setup frame isn't kept alive.
+    async_close_clients = partial(
+        async_release_shared_clients, hass, entry.entry_id, auth_token, login_token
     )
+    entry.async_on_unload(async_close_clients)
 
-    hass.data[DOMAIN][entry.entry_id] = {
-        "api_client": api_client,
-        "coordinator": coordinator,
-    }
+    try:
+        api_client = IQAirApiClient(
+            command_client_factory=command_client_factory,
+            state_client=state_client,
+            user_id=user_id,
+            serial_number=serial_number,
+            endpoint=api_endpoint,
+            device_prefix=device_prefix,
+        )
 
-    await coordinator.async_config_entry_first_refresh()
+        coordinator = IQAirDataUpdateCoordinator(
+            hass, api=api_client, device_id=entry.data["device_id"]
+        )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        entry.runtime_data = IQAirRuntimeData(api_client, coordinator)
 
-    entry.add_update_listener(update_listener)
+        # The first refresh must finish before forwarding to the platforms: the fan
+        # reads the model and feature set from coordinator data in its constructor.
+        await coordinator.async_config_entry_first_refresh()
 
-    async def async_close_clients() -> None:
-        """Close the httpx clients."""
-        await command_client.aclose()
-        await state_client.aclose()
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except BaseException:
+        # Releasing is idempotent, so this is safe even if Home Assistant also
+        # runs the unload callbacks after a failed setup
+        await async_close_clients()
+        raise
 
-    entry.async_on_unload(async_close_clients)
+    entry.add_update_listener(update_listener)
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-    return unload_ok
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
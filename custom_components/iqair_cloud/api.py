@@ -1,14 +1,32 @@
 """API client for the IQAir Cloud service."""
-import base64
+import asyncio
+import binascii
 import logging
 import re
+import ssl
 import struct
+import time
+from binascii import a2b_base64, b2a_base64
+from collections.abc import Callable, Iterator, Mapping
+from functools import cache
+from types import MappingProxyType
 from typing import Any
 
+import certifi
 import httpx
 
+from homeassistant.core import HomeAssistant
+
+try:
+    from homeassistant.util.ssl import SSL_ALPN_HTTP11_HTTP2, client_context
+except ImportError:  # Home Assistant releases without ALPN-aware SSL contexts
+    SSL_ALPN_HTTP11_HTTP2 = None
+    client_context = None
+
 from .const import (
+    SCAN_INTERVAL,
     GRPC_API_BASE_URL,
+    GRPC_API_HEADERS,
     WEB_API_URL,
     WEB_API_PARAMS,
     WEB_API_SIGNIN_URL,
@@ -28,50 +46,123 @@ from .const import (
     FIELD_AUTO_MODE,
     FIELD_AUTO_MODE_PROFILE,
     FIELD_LOCKS,
+    STATE_AUTO_MODE_ENABLED,
+    STATE_LOCKS_ENABLED,
+    STATE_LIGHT_INDICATOR_ENABLED,
 )
-from .exceptions import InvalidAuth
+from .exceptions import CommandFailed, InvalidAuth
 
 _LOGGER = logging.getLogger(__name__)
 
-
-def _decode_grpc_response(base64_string: str) -> str:
-    """Decodes a gRPC-Web Base64 response into a human-readable string."""
-    if not base64_string:
+# A handful of connections per client is plenty for a single device. Idle
+# connections are kept across two polling intervals so polls reuse them, and an
+# explicit pool timeout surfaces contention as errors instead of silent queueing.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=4,
+    max_keepalive_connections=4,
+    keepalive_expiry=SCAN_INTERVAL.total_seconds() * 2,
+)
+_HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=10.0, write=5.0, pool=2.0)
+
+# gRPC-Web frame header: 1 type byte followed by a 4-byte big-endian length
+_U32 = struct.Struct(">I")
+
+# How long a fetched device list is reused before asking the Web API again
+_DEVICES_CACHE_TTL = 5.0  # seconds
+
+# Map each command endpoint to the state update for the value in its response
+_ENDPOINT_DECODERS: dict[str, Callable[[int], dict[str, Any]]] = {
+    ENDPOINT_POWER: lambda value: {"powerMode": value},
+    ENDPOINT_FAN_SPEED: lambda value: {"speedLevel": value},
+    ENDPOINT_LIGHT_LEVEL: lambda value: {
+        "lightLevel": value,
+        STATE_LIGHT_INDICATOR_ENABLED: True,
+    },
+    ENDPOINT_LIGHT_INDICATOR: lambda value: {STATE_LIGHT_INDICATOR_ENABLED: value == 1},
+    ENDPOINT_AUTO_MODE: lambda value: {STATE_AUTO_MODE_ENABLED: value == 1},
+    ENDPOINT_AUTO_MODE_PROFILE: lambda value: {"autoModeProfile": value},
+    ENDPOINT_LOCKS: lambda value: {STATE_LOCKS_ENABLED: value == 1},
+}
+
+# State for switch endpoints that respond with an empty payload when turned off
+_ENDPOINT_OFF_STATES: dict[str, dict[str, Any]] = {
+    ENDPOINT_LIGHT_INDICATOR: {STATE_LIGHT_INDICATOR_ENABLED: False},
+    ENDPOINT_AUTO_MODE: {STATE_AUTO_MODE_ENABLED: False},
+    ENDPOINT_LOCKS: {STATE_LOCKS_ENABLED: False},
+}
+
+
+def _iter_b64_chunks(base64_data: bytes) -> Iterator[bytes]:
+    """Split concatenated base64 strings at the end of each run of padding."""
+    end = len(base64_data)
+    pos = 0
+    while pos < end:
+        pad_start = base64_data.find(b"=", pos)
+        if pad_start == -1:
+            yield base64_data[pos:]
+            return
+        pad_end = pad_start + 1
+        while pad_end < end and base64_data[pad_end] == 0x3D:  # "="
+            pad_end += 1
+        yield base64_data[pos:pad_end]
+        pos = pad_end
+
+
+def _b64decode_frames(base64_data: bytes) -> bytes:
+    """Decode a gRPC-Web text body into the raw bytes of all its frames.
+
+    Every frame is base64-encoded with its own padding and decoding stops at the
+    first padding, so each chunk is decoded separately and the results joined.
+    """
+    return b"".join(a2b_base64(chunk) for chunk in _iter_b64_chunks(base64_data))
+
+
+def _parse_grpc_frames(base64_data: bytes) -> list[tuple[int, int, bytes]]:
+    """Parse a gRPC-Web text body into (frame type, length, payload) tuples."""
+    raw = _b64decode_frames(base64_data)
+
+    # Walk the frames using their length prefixes, ignoring any trailing bytes
+    # too short to hold a frame header
+    frames = []
+    offset = 0
+    while offset + 5 <= len(raw):
+        frame_type = raw[offset]
+        (length,) = _U32.unpack_from(raw, offset + 1)
+        frames.append((frame_type, length, raw[offset + 5 : offset + 5 + length]))
+        offset += 5 + length
+
+    return frames
+
+
+def _format_hex_payload(payload: bytes) -> str:
+    """Format a binary frame payload as hex."""
+    return payload.hex(" ")
+
+
+def _format_text_payload(payload: bytes) -> str:
+    """Format a text frame payload as a quoted string."""
+    return f"'{payload.decode('utf-8').strip()}'"
+
+
+# Log label and payload formatter for each gRPC-Web frame type
+_FRAME_TYPES: dict[int, tuple[str, Callable[[bytes], str]]] = {
+    0x00: ("DATA (0x00)", _format_hex_payload),
+    0x80: ("TRAILERS (0x80)", _format_text_payload),
+}
+
+
+def _format_frames_for_log(frames: list[tuple[int, int, bytes]]) -> str:
+    """Format parsed gRPC-Web frames into a human-readable string."""
+    if not frames:
         return "  [Empty Response Body]"
 
-    # Split concatenated base64 strings into frames
-    delimited_input = re.sub(r"(=+)([A-Za-z0-9+/])", r"\1\n\2", base64_string)
-    base64_frames = [frame for frame in delimited_input.split("\n") if frame]
-    if not base64_frames and base64_string:
-        base64_frames.append(base64_string)
-
     decoded_output = []
-    for frame_b64 in base64_frames:
+    for frame_type, length, payload in frames:
+        frame_type_str, format_payload = _FRAME_TYPES.get(
+            frame_type, (f"Unknown (0x{frame_type:02x})", _format_hex_payload)
+        )
         try:
-            frame_bytes = base64.b64decode(frame_b64)
-            if len(frame_bytes) < 5:
-                decoded_output.append(
-                    f"  [Invalid Frame: Too short ({len(frame_bytes)} bytes)]"
-                )
-                continue
-
-            frame_type = frame_bytes[0]
-            # Unpack the 4-byte length header (big-endian)
-            length = struct.unpack(">I", frame_bytes[1:5])[0]
-            payload = frame_bytes[5:]
-
-            if frame_type == 0x00:
-                frame_type_str = "DATA (0x00)"
-                # Data payload is binary, show as hex
-                payload_str = " ".join(f"{b:02x}" for b in payload)
-            elif frame_type == 0x80:
-                frame_type_str = "TRAILERS (0x80)"
-                # Trailers payload is text
-                payload_str = f"'{payload.decode('utf-8').strip()}'"
-            else:
-                frame_type_str = f"Unknown (0x{frame_type:02x})"
-                payload_str = " ".join(f"{b:02x}" for b in payload)
-
+            payload_str = format_payload(payload)
             decoded_output.append(
                 f"  [Frame: {frame_type_str}, Length: {length}, Payload: {payload_str}]"
             )
@@ -82,12 +173,116 @@ def _decode_grpc_response(base64_string: str) -> str:
     return "\n".join(decoded_output)
 
 
+# Strong references to close tasks scheduled from __del__, so they aren't
+# garbage collected before they finish
+_CLOSE_TASKS: set[asyncio.Task[None]] = set()
+
+
+class _LoopPinnedAsyncClient(httpx.AsyncClient):
+    """An httpx client that closes itself on the loop it was created on.
+
+    If a client is garbage collected without being closed (e.g. during a reload
+    race), closing it from whatever loop happens to be running fails with a
+    cross-loop RuntimeError and leaks its sockets.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the client and remember the running loop."""
+        super().__init__(*args, **kwargs)
+        try:
+            self._creation_loop: asyncio.AbstractEventLoop | None = (
+                asyncio.get_running_loop()
+            )
+        except RuntimeError:
+            self._creation_loop = None
+
+    def __del__(self) -> None:
+        """Schedule closing on the creation loop if still open."""
+        loop = getattr(self, "_creation_loop", None)
+        if loop is None or self.is_closed or not loop.is_running():
+            return
+        # The coroutine is only created once the callback runs, so nothing is left
+        # un-awaited if the loop stops first
+        loop.call_soon_threadsafe(self._schedule_close, loop)
+
+    def _schedule_close(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start closing the client on its loop, keeping the task referenced."""
+        task = loop.create_task(self.aclose())
+        _CLOSE_TASKS.add(task)
+        task.add_done_callback(_CLOSE_TASKS.discard)
+
+
+@cache
+def _get_h2_ssl_context() -> ssl.SSLContext:
+    """Return an SSL context advertising HTTP/1.1 and HTTP/2 via ALPN.
+
+    On older Home Assistant releases the context is built here, which loads the
+    CA bundle and blocks, so async_prepare_ssl_context must run first.
+    """
+    if client_context is not None:
+        return client_context(alpn_protocols=SSL_ALPN_HTTP11_HTTP2)
+    context = ssl.create_default_context(cafile=certifi.where())
+    context.set_alpn_protocols(["http/1.1", "h2"])
+    return context
+
+
+async def async_prepare_ssl_context(hass: HomeAssistant) -> None:
+    """Build the clients' SSL context in the executor if it would block."""
+    if client_context is None:
+        await hass.async_add_executor_job(_get_h2_ssl_context)
+
+
+# Commands (GRPC_API_BASE_URL) and state requests (WEB_API_URL) are served from
+# different origins with different auth schemes. Connections can't be shared
+# across origins, so each gets its own client rather than one client with
+# per-request auth headers.
+def _build_command_headers(auth_token: str) -> Mapping[str, str]:
+    """Build the read-only gRPC request headers for an auth token."""
+    headers = dict(GRPC_API_HEADERS)
+    headers["Authorization"] = f"Bearer {auth_token}"
+    return MappingProxyType(headers)
+
+
+def create_command_client(auth_token: str) -> httpx.AsyncClient:
+    """Create the httpx client used for gRPC commands.
+
+    The SSL context is a pre-built HTTP/1.1 + HTTP/2 one (see
+    async_prepare_ssl_context), so constructing the client does no blocking
+    certificate loading and is safe in the event loop. The shared default context
+    must not be used: httpcore sets the h2 ALPN protocols on whatever context an
+    HTTP/2 client is given.
+    """
+    return _LoopPinnedAsyncClient(
+        http2=True,
+        verify=_get_h2_ssl_context(),
+        headers=_build_command_headers(auth_token),
+        limits=_HTTP_LIMITS,
+        timeout=_HTTP_TIMEOUT,
+    )
+
+
+def create_state_client(login_token: str) -> httpx.AsyncClient:
+    """Create the httpx client used for Web API state requests.
+
+    The client must be kept and reused for the coordinator's lifetime rather than
+    recreated per request, otherwise every poll pays for a new TLS handshake.
+    Like the command client, it needs an h2 SSL context of its own.
+    """
+    return _LoopPinnedAsyncClient(
+        http2=True,
+        verify=_get_h2_ssl_context(),
+        headers={"x-login-token": login_token},
+        limits=_HTTP_LIMITS,
+        timeout=_HTTP_TIMEOUT,
+    )
+
+
 class IQAirApiClient:
     """A client to communicate with the IQAir Cloud APIs."""
 
     def __init__(
         self,
-        command_client: httpx.AsyncClient,
+        command_client_factory: Callable[[], httpx.AsyncClient] | None,
         state_client: httpx.AsyncClient,
         user_id: str,
         serial_number: str | None,
@@ -96,102 +291,112 @@ class IQAirApiClient:
     ):
         """Initialize the API client."""
         self._user_id = user_id
-        self._command_client = command_client
+        self._command_client_factory = command_client_factory
+        self._command_client: httpx.AsyncClient | None = None
         self._state_client = state_client
         self._serial_number = serial_number
         self._endpoint = endpoint
         self._device_prefix = device_prefix
 
+        self._devices_cache: tuple[float, list[dict[str, Any]]] | None = None
+        self._indexed_devices: list[dict[str, Any]] | None = None
+        self._device_index: dict[str, dict[str, Any]] = {}
+
+        # The serial number field is the same in every command payload
+        self._sn_field: bytes | None = None
+        if serial_number:
+            # The payload uses the serial number without the prefix (e.g. "UI2_" or "KLR_")
+            prefix = f"{device_prefix}_"
+            sn_part = serial_number.removeprefix(prefix).lower().encode("ascii")
+            self._sn_field = bytes([0x0A, len(sn_part)]) + sn_part
+
+    def _ensure_command_client(self) -> httpx.AsyncClient:
+        """Return the command client, creating it on the first command."""
+        if self._command_client is None:
+            if self._command_client_factory is None:
+                raise ValueError("Command client is not configured")
+            self._command_client = self._command_client_factory()
+        return self._command_client
+
     def _build_payload(self, field: int, value: int | None = None) -> str:
         """Build the gRPC payload."""
-        if not self._serial_number:
-            raise ValueError("Serial number is not set")
+        if self._sn_field is None:
+            raise CommandFailed("Serial number is not set")
 
-        # The payload uses the serial number without the prefix (e.g. "UI2_" or "KLR_")
-        prefix = f"{self._device_prefix}_"
-        sn_part = self._serial_number.replace(prefix, "").lower().encode("utf-8")
-        payload_bytes = bytearray([0x0A, len(sn_part)]) + sn_part
+        sn_field = self._sn_field
+        body_len = len(sn_field) + (2 if value is not None else 0)
 
-        if value is not None:
-            payload_bytes += bytearray([field, value])
+        # Build the framed payload in one buffer: 1-byte type, 4-byte length,
+        # then the serial number field and the optional value field
+        buf = bytearray(5 + body_len)
+        buf[0] = 0x00
+        _U32.pack_into(buf, 1, body_len)
+        buf[5 : 5 + len(sn_field)] = sn_field
 
-        # Frame the payload
-        length = len(payload_bytes)
-        frame = struct.pack(">I", length)  # 4-byte length
-        framed_payload = bytearray([0x00]) + frame + payload_bytes  # 1-byte type
+        if value is not None:
+            buf[-2] = field
+            buf[-1] = value
 
-        return base64.b64encode(framed_payload).decode("utf-8")
+        return b2a_base64(buf, newline=False).decode("ascii")
 
     async def _send_command(
         self, endpoint: str, payload: str, context: str | None = None
-    ) -> dict[str, Any] | None:
+    ) -> dict[str, Any]:
         """Send a command request to the gRPC API and return the new state."""
         url = f"{GRPC_API_BASE_URL}{self._endpoint}{endpoint}"
         context_str = f" ({context})" if context else ""
+        response: httpx.Response | None = None
         try:
-            response = await self._command_client.post(url, content=payload)
+            response = await self._ensure_command_client().post(url, content=payload)
             response.raise_for_status()
-            decoded_response = _decode_grpc_response(response.text)
-            _LOGGER.debug(
-                "Command to %s successful%s. Status: %s, Version: %s\nRequest Body: %s\nResponse Body:\n%s",
-                url,
-                context_str,
-                response.status_code,
-                response.http_version,
-                payload,
-                decoded_response,
-            )
 
-            # Parse the response to extract the new state
-            delimited_input = re.sub(r"(=+)([A-Za-z0-9+/])", r"\1\n\2", response.text)
-            base64_frames = [frame for frame in delimited_input.split("\n") if frame]
-            if not base64_frames and response.text:
-                base64_frames.append(response.text)
+            # The device state changed, so a cached device list is now stale
+            self._devices_cache = None
+
+            # Parse the response once, for both the log and the new state
+            frames = _parse_grpc_frames(response.content)
+
+            # Formatting the frames for the log is costly, so only do it when needed
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Command to %s successful%s. Status: %s, Version: %s\nRequest Body: %s\nResponse Body:\n%s",
+                    url,
+                    context_str,
+                    response.status_code,
+                    response.http_version,
+                    payload,
+                    _format_frames_for_log(frames),
+                )
 
-            new_state = {}
-            if not base64_frames:
+            if not frames:
                 return {}
 
-            first_frame_b64 = base64_frames[0]
-            frame_bytes = base64.b64decode(first_frame_b64)
-
-            # Check for empty payload which indicates "off" for some switches
-            if len(frame_bytes) == 5:
-                if endpoint == ENDPOINT_LIGHT_INDICATOR:
-                    return {"lightIndicatorEnabled": False}
-                if endpoint == ENDPOINT_AUTO_MODE:
-                    return {"autoModeEnabled": False}
-                if endpoint == ENDPOINT_LOCKS:
-                    return {"isLocksEnabled": False}
-
-            if len(frame_bytes) > 6 and frame_bytes[0] == 0x00:  # DATA Frame
-                value = frame_bytes[6]
-                if endpoint == ENDPOINT_POWER:
-                    new_state = {"powerMode": value}
-                elif endpoint == ENDPOINT_FAN_SPEED:
-                    new_state = {"speedLevel": value}
-                elif endpoint == ENDPOINT_LIGHT_LEVEL:
-                    new_state = {"lightLevel": value, "lightIndicatorEnabled": True}
-                elif endpoint == ENDPOINT_LIGHT_INDICATOR:
-                    new_state = {"lightIndicatorEnabled": value == 1}
-                elif endpoint == ENDPOINT_AUTO_MODE:
-                    new_state = {"autoModeEnabled": value == 1}
-                elif endpoint == ENDPOINT_AUTO_MODE_PROFILE:
-                    new_state = {"autoModeProfile": value}
-                elif endpoint == ENDPOINT_LOCKS:
-                    new_state = {"isLocksEnabled": value == 1}
-
-            return new_state
-
-        except (httpx.RequestError, base64.binascii.Error, IndexError, ValueError) as e:
-            _LOGGER.error(
-                "Error sending or parsing command to %s%s: %s", url, context_str, e
-            )
-            return None
+            # Only the first frame is needed to extract the new state
+            frame_type, length, frame_payload = frames[0]
+
+            # An empty payload indicates "off" for some switches
+            if length == 0 and (off_state := _ENDPOINT_OFF_STATES.get(endpoint)):
+                return dict(off_state)
+
+            if length > 1 and frame_type == 0x00:  # DATA Frame
+                if decoder := _ENDPOINT_DECODERS.get(endpoint):
+                    return decoder(frame_payload[1])
+
+            return {}
+
+        except (httpx.HTTPError, binascii.Error, IndexError, ValueError) as e:
+            # The frames couldn't be logged above, so keep the raw body for debugging
+            if response is not None:
+                _LOGGER.debug(
+                    "Raw response body from %s%s: %r", url, context_str, response.content
+                )
+            raise CommandFailed(
+                f"Error sending or parsing command to {url}{context_str}: {e}"
+            ) from e
 
     async def set_power(
         self, is_on: bool, context: str | None = None
-    ) -> dict[str, Any] | None:
+    ) -> dict[str, Any]:
         """Set the power state of the device."""
         value = 2 if is_on else 3
         payload = self._build_payload(FIELD_POWER, value)
@@ -217,7 +422,7 @@ class IQAirApiClient:
         payload = self._build_payload(FIELD_FAN_SPEED_PERCENT, percentage)
         return await self._send_command(ENDPOINT_FAN_SPEED, payload, context=context)
 
-    async def set_light_indicator(self, is_on: bool) -> dict[str, Any] | None:
+    async def set_light_indicator(self, is_on: bool) -> dict[str, Any]:
         """Set the light indicator state."""
         value = 1 if is_on else None
         payload = self._build_payload(FIELD_LIGHT_INDICATOR, value)
@@ -231,7 +436,7 @@ class IQAirApiClient:
         payload = self._build_payload(FIELD_LIGHT_LEVEL, level)
         return await self._send_command(ENDPOINT_LIGHT_LEVEL, payload)
 
-    async def set_auto_mode(self, is_on: bool) -> dict[str, Any] | None:
+    async def set_auto_mode(self, is_on: bool) -> dict[str, Any]:
         """Set the auto mode state."""
         value = 1 if is_on else None
         payload = self._build_payload(FIELD_AUTO_MODE, value)
@@ -245,7 +450,7 @@ class IQAirApiClient:
         payload = self._build_payload(FIELD_AUTO_MODE_PROFILE, profile_id)
         return await self._send_command(ENDPOINT_AUTO_MODE_PROFILE, payload)
 
-    async def set_lock(self, is_on: bool) -> dict[str, Any] | None:
+    async def set_lock(self, is_on: bool) -> dict[str, Any]:
         """Set the control panel lock state."""
         value = 1 if is_on else None
         payload = self._build_payload(FIELD_LOCKS, value)
@@ -253,11 +458,18 @@ class IQAirApiClient:
 
     async def async_get_devices(self) -> list[dict[str, Any]]:
         """Fetch all devices from the Web API."""
+        if self._devices_cache is not None:
+            fetched_at, devices = self._devices_cache
+            if time.monotonic() - fetched_at < _DEVICES_CACHE_TTL:
+                return devices
+
         url = WEB_API_URL.format(user_id=self._user_id)
         try:
             response = await self._state_client.get(url, params=WEB_API_PARAMS)
             response.raise_for_status()
-            return response.json()
+            devices = response.json()
+            self._devices_cache = (time.monotonic(), devices)
+            return devices
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 401:
                 _LOGGER.error(
@@ -274,12 +486,15 @@ class IQAirApiClient:
         """Fetch state for a specific device."""
         try:
             devices = await self.async_get_devices()
-            return next(
-                (device for device in devices if device.get("id") == device_id), None
-            )
         except httpx.HTTPStatusError:
             return None
 
+        # Only re-index when a different device list came back
+        if devices is not self._indexed_devices:
+            self._indexed_devices = devices
+            self._device_index = {device.get("id"): device for device in devices}
+        return self._device_index.get(device_id)
+
 
 async def async_get_cloud_api_auth_token(
     session: httpx.AsyncClient,
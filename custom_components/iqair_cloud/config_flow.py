@@ -1,5 +1,7 @@
 """Config flow for IQAir Cloud."""
+import asyncio
 import logging
+import time
 from typing import Any
 
 import httpx
@@ -10,6 +12,9 @@ from homeassistant.const import CONF_PASSWORD
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.ulid import ulid_now
+
+from . import async_release_shared_clients
 
 from .const import (
     DOMAIN,
@@ -25,30 +30,73 @@ from .const import (
     DEFAULT_DEVICE_PREFIX,
     API_SERVICE_UI2,
     API_SERVICE_KLR,
+    SHARED_CLIENTS,
+)
+from .api import (
+    IQAirApiClient,
+    async_signin,
+    async_get_cloud_api_auth_token,
+    async_prepare_ssl_context,
+    create_state_client,
 )
-from .api import IQAirApiClient, async_signin, async_get_cloud_api_auth_token
 from .exceptions import CannotConnect, InvalidAuth, NoDevicesFound
 
 _LOGGER = logging.getLogger(__name__)
 
-
-async def create_state_client(hass: HomeAssistant, login_token: str) -> httpx.AsyncClient:
-    """Create the httpx state client in a thread-safe way."""
-
-    def _create_client() -> httpx.AsyncClient:
-        """Create the httpx client."""
-        return httpx.AsyncClient(headers={"x-login-token": login_token})
-
-    return await hass.async_add_executor_job(_create_client)
+# Device lists fetched during config flows, keyed by (user_id, login_token), so
+# navigating back and forth between steps doesn't refetch them every time.
+_DEVICES_CACHE: dict[tuple[str, str], tuple[float, list[dict[str, Any]]]] = {}
+_DEVICES_CACHE_TTL = 30  # seconds
+_DEVICES_CACHE_MAX_SIZE = 8
+_CLIENT_CLOSE_TIMEOUT = 5  # seconds
+
+_CREDENTIALS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_EMAIL): str,
+        vol.Required(CONF_PASSWORD): str,
+    }
+)
+_TOKENS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_LOGIN_TOKEN): str,
+        vol.Required(CONF_USER_ID): str,
+        vol.Required(CONF_AUTH_TOKEN): str,
+    }
+)
 
 
 async def validate_connection(
     hass: HomeAssistant, login_token: str, user_id: str
 ) -> list[dict[str, Any]]:
     """Validate the user input allows us to connect."""
-    state_client = await create_state_client(hass, login_token)
+    # Drop expired entries, including those left behind by abandoned flows
+    now = time.monotonic()
+    for key in [
+        key
+        for key, (fetched_at, _) in _DEVICES_CACHE.items()
+        if now - fetched_at >= _DEVICES_CACHE_TTL
+    ]:
+        del _DEVICES_CACHE[key]
+
+    cache_key = (user_id, login_token)
+    if (cached := _DEVICES_CACHE.get(cache_key)) is not None:
+        return cached[1]
+
+    await async_prepare_ssl_context(hass)
+
+    # Reuse the state client of a loaded entry with the same login token, if any
+    shared_clients = hass.data.get(DOMAIN, {}).get(SHARED_CLIENTS, {})
+    shared_key = next((key for key in shared_clients if key[1] == login_token), None)
+    holder_id = f"config_flow_{ulid_now()}"
+    if shared_key is not None:
+        # Hold the clients so unloading their entry mid-request can't close them
+        shared = shared_clients[shared_key]
+        shared["holders"].add(holder_id)
+        state_client = shared["state_client"]
+    else:
+        state_client = create_state_client(login_token)
     api_client = IQAirApiClient(
-        command_client=None,  # Not needed for validation
+        command_client_factory=None,  # Not needed for validation
         state_client=state_client,
         user_id=user_id,
         serial_number=None,
@@ -65,11 +113,23 @@ async def validate_connection(
     except httpx.RequestError as exc:
         raise CannotConnect from exc
     finally:
-        await state_client.aclose()
+        if shared_key is not None:
+            await async_release_shared_clients(hass, holder_id, *shared_key)
+        else:
+            try:
+                async with asyncio.timeout(_CLIENT_CLOSE_TIMEOUT):
+                    await state_client.aclose()
+            except TimeoutError:
+                _LOGGER.debug("Timed out closing the validation client")
 
     if not devices:
         raise NoDevicesFound
 
+    # Evict the oldest entry once the cache is full
+    if len(_DEVICES_CACHE) >= _DEVICES_CACHE_MAX_SIZE:
+        del _DEVICES_CACHE[next(iter(_DEVICES_CACHE))]
+    _DEVICES_CACHE[cache_key] = (time.monotonic(), devices)
+
     return devices
 
 
@@ -78,7 +138,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
     _user_input: dict[str, Any] = {}
-    _devices: list[dict[str, Any]] = []
+    _devices_by_id: dict[str, dict[str, Any]] = {}
+    _device_options: dict[str, str] = {}
+    _select_device_schema: vol.Schema | None = None
 
     @staticmethod
     @callback
@@ -88,6 +150,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Get the options flow for this handler."""
         return IQAirOptionsFlowHandler(config_entry)
 
+    def _set_devices(self, devices: list[dict[str, Any]]) -> None:
+        """Build the lookups for a freshly fetched device list."""
+        self._devices_by_id = {dev["id"]: dev for dev in devices}
+        self._device_options = {dev["id"]: dev["name"] for dev in devices}
+        self._select_device_schema = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -117,22 +185,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     errors["base"] = "cannot_connect"
                     return self.async_show_form(
                         step_id="credentials",
-                        data_schema=vol.Schema(
-                            {
-                                vol.Required(CONF_EMAIL): str,
-                                vol.Required(CONF_PASSWORD): str,
-                            }
-                        ),
+                        data_schema=_CREDENTIALS_SCHEMA,
                         errors=errors,
                     )
                 self._user_input[CONF_AUTH_TOKEN] = auth_token
 
                 try:
-                    self._devices = await validate_connection(
+                    devices = await validate_connection(
                         self.hass,
                         self._user_input[CONF_LOGIN_TOKEN],
                         self._user_input[CONF_USER_ID],
                     )
+                    self._set_devices(devices)
                     return await self.async_step_select_device()
                 except CannotConnect:
                     errors["base"] = "cannot_connect"
@@ -145,12 +209,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="credentials",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_EMAIL): str,
-                    vol.Required(CONF_PASSWORD): str,
-                }
-            ),
+            data_schema=_CREDENTIALS_SCHEMA,
             errors=errors,
         )
 
@@ -162,9 +221,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             self._user_input = user_input
             try:
-                self._devices = await validate_connection(
+                devices = await validate_connection(
                     self.hass, user_input[CONF_LOGIN_TOKEN], user_input[CONF_USER_ID]
                 )
+                self._set_devices(devices)
                 return await self.async_step_select_device()
             except CannotConnect:
                 errors["base"] = "cannot_connect"
@@ -178,13 +238,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="tokens",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_LOGIN_TOKEN): str,
-                    vol.Required(CONF_USER_ID): str,
-                    vol.Required(CONF_AUTH_TOKEN): str,
-                }
-            ),
+            data_schema=_TOKENS_SCHEMA,
             errors=errors,
         )
 
@@ -194,10 +248,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the device selection step."""
         if user_input is not None:
             device_id = user_input[CONF_DEVICE_ID]
-            device = next(dev for dev in self._devices if dev["id"] == device_id)
+            device = self._devices_by_id[device_id]
             device_name = device["name"]
             serial_number = device["serialNumber"]
 
+            # The flow ends here whichever way it goes, including the aborts below
+            _DEVICES_CACHE.pop(
+                (self._user_input[CONF_USER_ID], self._user_input[CONF_LOGIN_TOKEN]),
+                None,
+            )
+
             if self.context.get("source") == config_entries.SOURCE_REAUTH:
                 existing_entry = self.hass.config_entries.async_get_entry(
                     self.context["entry_id"]
@@ -232,10 +292,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             return self.async_create_entry(title=device_name, data=data)
 
-        device_options = {dev["id"]: dev["name"] for dev in self._devices}
+        if self._select_device_schema is None:
+            self._select_device_schema = vol.Schema(
+                {vol.Required(CONF_DEVICE_ID): vol.In(self._device_options)}
+            )
         return self.async_show_form(
             step_id="select_device",
-            data_schema=vol.Schema({vol.Required(CONF_DEVICE_ID): vol.In(device_options)}),
+            data_schema=self._select_device_schema,
         )
 
     async def async_step_reauth(self, entry_data: dict[str, Any]) -> FlowResult:
@@ -1,10 +1,20 @@
 """Constants for the IQAir Cloud integration."""
+from types import MappingProxyType
 from typing import Final
 from datetime import timedelta
 
 DOMAIN: Final = "iqair_cloud"
 SCAN_INTERVAL = timedelta(seconds=30)
 
+# Shared read-only fallback for missing sub-dicts, avoids allocating a new {}
+EMPTY_MAPPING: Final = MappingProxyType({})
+
+UPDATE_RETRY_ATTEMPTS: Final = 3
+UPDATE_RETRY_BACKOFF: Final = 0.3  # seconds, doubled after each failed attempt
+
+# Key in hass.data[DOMAIN] holding httpx clients shared between config entries
+SHARED_CLIENTS: Final = "_shared_clients"
+
 # --- Configuration Keys ---
 CONF_EMAIL: Final = "email"
 CONF_PASSWORD: Final = "password"
@@ -53,6 +63,11 @@ ENDPOINT_AUTO_MODE: Final = "/SetAutoMode"
 ENDPOINT_AUTO_MODE_PROFILE: Final = "/SetAutoModeProfile"
 ENDPOINT_LOCKS: Final = "/SetDefaultLocks"
 
+# --- Device State Keys (in the "remote" state) ---
+STATE_AUTO_MODE_ENABLED: Final = "autoModeEnabled"
+STATE_LOCKS_ENABLED: Final = "isLocksEnabled"
+STATE_LIGHT_INDICATOR_ENABLED: Final = "lightIndicatorEnabled"
+
 # --- gRPC Payload Fields ---
 FIELD_POWER: Final = 0x10
 FIELD_FAN_SPEED: Final = 0x18
@@ -65,4 +80,6 @@ FIELD_LOCKS: Final = 0x10
 
 # --- Mappings ---
 LIGHT_LEVEL_MAP: Final = {1: "Low", 2: "Medium", 3: "High"}
-AUTO_MODE_PROFILE_MAP: Final = {1: "Quiet", 2: "Balanced", 3: "Max"}
\ No newline at end of file
+AUTO_MODE_PROFILE_MAP: Final = {1: "Quiet", 2: "Balanced", 3: "Max"}
+LIGHT_LEVEL_REVERSE: Final = {v: k for k, v in LIGHT_LEVEL_MAP.items()}
+AUTO_MODE_PROFILE_REVERSE: Final = {v: k for k, v in AUTO_MODE_PROFILE_MAP.items()}
@@ -1,13 +1,14 @@
 """Data update coordinator for the IQAir Cloud integration."""
+from dataclasses import dataclass
 from typing import Any
-import copy
+import asyncio
 import logging
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, SCAN_INTERVAL
+from .const import DOMAIN, SCAN_INTERVAL, UPDATE_RETRY_ATTEMPTS, UPDATE_RETRY_BACKOFF
 from .api import IQAirApiClient
 from .exceptions import InvalidAuth
 
@@ -30,18 +31,37 @@ class IQAirDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via library."""
-        try:
-            data = await self.api.async_get_device_state(self.device_id)
-            if not data:
-                raise UpdateFailed("Device not found or API error")
-            _LOGGER.debug("Full 'remote' data: %s", data.get("remote"))
-            return data
-        except InvalidAuth as err:
-            raise ConfigEntryAuthFailed from err
+        # The API client logs and swallows transient request errors, so retry a
+        # few times with backoff before marking the entities unavailable.
+        for attempt in range(UPDATE_RETRY_ATTEMPTS):
+            try:
+                data = await self.api.async_get_device_state(self.device_id)
+            except InvalidAuth as err:
+                raise ConfigEntryAuthFailed from err
+            if data:
+                _LOGGER.debug("Full 'remote' data: %s", data.get("remote"))
+                return data
+            if attempt < UPDATE_RETRY_ATTEMPTS - 1:
+                await asyncio.sleep(UPDATE_RETRY_BACKOFF * 2**attempt)
+
+        raise UpdateFailed("Device not found or API error")
 
     def update_from_command(self, update_data: dict[str, Any]):
         """Update coordinator data from a command response."""
         if self.data and update_data:
-            new_data = copy.deepcopy(self.data)
-            new_data["remote"].update(update_data)
-            self.async_set_updated_data(new_data)
\ No newline at end of file
+            remote = self.data.get("remote", {})
+            # Skip notifying listeners if the command didn't change anything
+            if all(remote.get(key) == value for key, value in update_data.items()):
+                return
+            # Only "remote" changes, so the rest of the tree can be shared
+            new_data = dict(self.data)
+            new_data["remote"] = {**remote, **update_data}
+            self.async_set_updated_data(new_data)
+
+
+@dataclass(slots=True, frozen=True)
+class IQAirRuntimeData:
+    """Runtime data stored on an IQAir Cloud config entry."""
+
+    api_client: IQAirApiClient
+    coordinator: IQAirDataUpdateCoordinator
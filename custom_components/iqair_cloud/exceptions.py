@@ -11,4 +11,8 @@ class InvalidAuth(HomeAssistantError):
 
 
 class NoDevicesFound(HomeAssistantError):
-    """Error to indicate no devices were found."""
\ No newline at end of file
+    """Error to indicate no devices were found."""
+
+
+class CommandFailed(HomeAssistantError):
+    """Error to indicate a command could not be sent or its response parsed."""
@@ -1,6 +1,5 @@
 """Fan platform for IQAir Cloud."""
 import logging
-import math
 from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
@@ -8,7 +7,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, CONF_DEVICE_ID
+from .const import DOMAIN, CONF_DEVICE_ID, EMPTY_MAPPING
 from .api import IQAirApiClient
 from .coordinator import IQAirDataUpdateCoordinator
 
@@ -21,10 +20,8 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IQAir fan entity."""
-    api_client: IQAirApiClient = hass.data[DOMAIN][entry.entry_id]["api_client"]
-    coordinator: IQAirDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "coordinator"
-    ]
+    api_client: IQAirApiClient = entry.runtime_data.api_client
+    coordinator: IQAirDataUpdateCoordinator = entry.runtime_data.coordinator
     device_id = entry.data[CONF_DEVICE_ID]
 
     async_add_entities([IQAirFan(coordinator, api_client, device_id, entry)])
@@ -74,17 +71,19 @@ class IQAirFan(FanEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true if the fan is on."""
-        if not self.available or self.coordinator.data is None:
+        data = self.coordinator.data
+        if not self.available or data is None:
             return None
         # powerMode is 2 when on, 3 when off
-        return self.coordinator.data.get("remote", {}).get("powerMode") == 2
+        return (data.get("remote") or EMPTY_MAPPING).get("powerMode") == 2
 
     @property
     def percentage(self) -> int | None:
         """Return the current speed percentage."""
-        if not self.available or self.coordinator.data is None:
+        data = self.coordinator.data
+        if not self.available or data is None:
             return None
-        return self.coordinator.data.get("remote", {}).get("speedPercent")
+        return (data.get("remote") or EMPTY_MAPPING).get("speedPercent")
 
     @property
     def percentage_step(self) -> float:
@@ -98,8 +97,8 @@ class IQAirFan(FanEntity):
         """Return the number of speeds the fan supports."""
         if self._is_percentage_control:
             return 100
-        if self.coordinator.data:
-            return self.coordinator.data.get("remote", {}).get("maxSpeedLevel", 1)
+        if data := self.coordinator.data:
+            return (data.get("remote") or EMPTY_MAPPING).get("maxSpeedLevel", 1)
         return 1
 
     async def async_turn_on(
@@ -113,14 +112,12 @@ class IQAirFan(FanEntity):
             await self.async_set_percentage(percentage)
         else:
             update_data = await self._api.set_power(True, context="fan.turn_on")
-            if update_data is not None:
-                self._update_state_from_response(update_data)
+            self._update_state_from_response(update_data)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the fan off."""
         update_data = await self._api.set_power(False, context="fan.turn_off")
-        if update_data is not None:
-            self._update_state_from_response(update_data)
+        self._update_state_from_response(update_data)
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed of the fan."""
@@ -134,8 +131,10 @@ class IQAirFan(FanEntity):
                 percentage, context="fan.set_percentage"
             )
         else:
-            speed_level = math.ceil(percentage / 100 * self.speed_count)
-            speed_level = max(1, min(self.speed_count, speed_level))
+            speed_count = self.speed_count
+            # Integer ceil(percentage / 100 * speed_count)
+            speed_level = (percentage * speed_count + 99) // 100
+            speed_level = max(1, min(speed_count, speed_level))
             update_data = await self._api.set_fan_speed(
                 speed_level, context="fan.set_percentage"
             )
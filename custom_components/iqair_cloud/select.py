@@ -7,7 +7,15 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, CONF_DEVICE_ID, AUTO_MODE_PROFILE_MAP, LIGHT_LEVEL_MAP
+from .const import (
+    DOMAIN,
+    CONF_DEVICE_ID,
+    EMPTY_MAPPING,
+    AUTO_MODE_PROFILE_MAP,
+    AUTO_MODE_PROFILE_REVERSE,
+    LIGHT_LEVEL_MAP,
+    LIGHT_LEVEL_REVERSE,
+)
 from .api import IQAirApiClient
 from .coordinator import IQAirDataUpdateCoordinator
 
@@ -20,10 +28,8 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IQAir select entity."""
-    coordinator: IQAirDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "coordinator"
-    ]
-    api_client: IQAirApiClient = hass.data[DOMAIN][entry.entry_id]["api_client"]
+    coordinator: IQAirDataUpdateCoordinator = entry.runtime_data.coordinator
+    api_client: IQAirApiClient = entry.runtime_data.api_client
     device_id = entry.data[CONF_DEVICE_ID]
 
     async_add_entities(
@@ -69,17 +75,16 @@ class IQAirAutoModeProfileSelect(SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the selected option."""
-        if not self.available or self.coordinator.data is None:
+        data = self.coordinator.data
+        if not self.available or data is None:
             return None
-        profile_id = self.coordinator.data.get("remote", {}).get("autoModeProfile")
+        profile_id = (data.get("remote") or EMPTY_MAPPING).get("autoModeProfile")
         return AUTO_MODE_PROFILE_MAP.get(profile_id)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         # Find the profile ID for the selected option name
-        profile_id = next(
-            (k for k, v in AUTO_MODE_PROFILE_MAP.items() if v == option), None
-        )
+        profile_id = AUTO_MODE_PROFILE_REVERSE.get(option)
         if profile_id is not None:
             update_data = await self._api.set_auto_mode_profile(profile_id)
             if update_data is not None:
@@ -127,17 +132,16 @@ class IQAirLightLevelSelect(SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the selected option."""
-        if not self.available or self.coordinator.data is None:
+        data = self.coordinator.data
+        if not self.available or data is None:
             return None
-        level_id = self.coordinator.data.get("remote", {}).get("lightLevel")
+        level_id = (data.get("remote") or EMPTY_MAPPING).get("lightLevel")
         return LIGHT_LEVEL_MAP.get(level_id)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         # Find the level ID for the selected option name
-        level_id = next(
-            (k for k, v in LIGHT_LEVEL_MAP.items() if v == option), None
-        )
+        level_id = LIGHT_LEVEL_REVERSE.get(option)
         if level_id is not None:
             update_data = await self._api.set_light_level(level_id)
             if update_data is not None:
@@ -1,5 +1,6 @@
 """Switch platform for IQAir Cloud."""
 import logging
+from collections.abc import Awaitable, Callable
 from typing import Any
 from dataclasses import dataclass
 
@@ -8,21 +9,41 @@ from homeassistant.components.switch import (
     SwitchEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .const import DOMAIN, CONF_DEVICE_ID
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    DOMAIN,
+    CONF_DEVICE_ID,
+    STATE_AUTO_MODE_ENABLED,
+    STATE_LOCKS_ENABLED,
+    STATE_LIGHT_INDICATOR_ENABLED,
+)
 from .api import IQAirApiClient
-from .coordinator import IQAirDataUpdateCoordinator
+from .coordinator import IQAirDataUpdateCoordinator, IQAirRuntimeData
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _remote_getter(key: str) -> Callable[[dict[str, Any] | None], bool | None]:
+    """Return a function reading a key from the device's "remote" state."""
+
+    def _get(data: dict[str, Any] | None) -> bool | None:
+        """Read the key, or None if there is no state yet."""
+        remote = data.get("remote") if data else None
+        return remote.get(key) if remote else None
+
+    return _get
+
+
 @dataclass(frozen=True, kw_only=True)
 class IQAirSwitchEntityDescription(SwitchEntityDescription):
     """Describes an IQAir switch entity."""
 
-    state_key: str
+    value_fn: Callable[[dict[str, Any] | None], bool | None]
+    setter: Callable[[IQAirApiClient, bool], Awaitable[dict[str, Any]]]
 
 
 SWITCH_TYPES: tuple[IQAirSwitchEntityDescription, ...] = (
@@ -30,19 +51,22 @@ SWITCH_TYPES: tuple[IQAirSwitchEntityDescription, ...] = (
         key="auto_mode",
         name="Smart Mode",
         icon="mdi:fan-auto",
-        state_key="autoModeEnabled",
+        value_fn=_remote_getter(STATE_AUTO_MODE_ENABLED),
+        setter=IQAirApiClient.set_auto_mode,
     ),
     IQAirSwitchEntityDescription(
         key="control_panel_lock",
         name="Control Panel Lock",
         icon="mdi:lock",
-        state_key="isLocksEnabled",
+        value_fn=_remote_getter(STATE_LOCKS_ENABLED),
+        setter=IQAirApiClient.set_lock,
     ),
     IQAirSwitchEntityDescription(
         key="display_light",
         name="Display Light",
         icon="mdi:lightbulb",
-        state_key="lightIndicatorEnabled",
+        value_fn=_remote_getter(STATE_LIGHT_INDICATOR_ENABLED),
+        setter=IQAirApiClient.set_light_indicator,
     ),
 )
 
@@ -53,89 +77,84 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the IQAir switch entities."""
-    coordinator: IQAirDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "coordinator"
-    ]
-    api_client: IQAirApiClient = hass.data[DOMAIN][entry.entry_id]["api_client"]
+    runtime_data: IQAirRuntimeData = entry.runtime_data
+    coordinator = runtime_data.coordinator
+    api_client = runtime_data.api_client
     device_id = entry.data[CONF_DEVICE_ID]
 
-    entities = [
-        IQAirSwitch(coordinator, api_client, device_id, entry, description)
+    # All switches belong to the same device, so they can share its info
+    device_info: DeviceInfo = {
+        "identifiers": {(DOMAIN, device_id)},
+        "name": entry.title,
+        "manufacturer": "IQAir",
+    }
+
+    async_add_entities(
+        IQAirSwitch(coordinator, api_client, device_id, device_info, description)
         for description in SWITCH_TYPES
-    ]
-    async_add_entities(entities)
+    )
 
 
-class IQAirSwitch(SwitchEntity):
+class IQAirSwitch(CoordinatorEntity[IQAirDataUpdateCoordinator], SwitchEntity):
     """Representation of an IQAir Cloud switch."""
 
+    # The Home Assistant base classes keep a __dict__, so only this class's own
+    # attributes can live in slots
+    __slots__ = ("_api", "_device_id", "_last_value", "_last_available")
+
     entity_description: IQAirSwitchEntityDescription
     _attr_has_entity_name = True
-    _attr_should_poll = False
 
     def __init__(
         self,
         coordinator: IQAirDataUpdateCoordinator,
         api_client: IQAirApiClient,
         device_id: str,
-        entry: ConfigEntry,
+        device_info: DeviceInfo,
         description: IQAirSwitchEntityDescription,
     ):
         """Initialize the switch."""
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self._api = api_client
         self._device_id = device_id
         self.entity_description = description
         self._attr_unique_id = f"{device_id}_{description.key}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": entry.title,
-            "manufacturer": "IQAir",
-        }
+        self._attr_device_info = device_info
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity was added."""
+        await super().async_added_to_hass()
+        # What was last written to the state machine, see _handle_coordinator_update
+        self._last_value = self.entity_description.value_fn(self.coordinator.data)
+        self._last_available = self.coordinator.last_update_success
 
     @property
     def is_on(self) -> bool | None:
         """Return true if the switch is on."""
-        if not self.available or self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("remote", {}).get(
-            self.entity_description.state_key
+        return self.entity_description.value_fn(self.coordinator.data)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if this switch's value or availability changed."""
+        value = self.entity_description.value_fn(self.coordinator.data)
+        available = self.coordinator.last_update_success
+        if value == self._last_value and available == self._last_available:
+            return
+        self._last_value = value
+        self._last_available = available
+        self.async_write_ha_state()
+
+    async def _async_set(self, value: bool) -> None:
+        """Set the switch state and apply the command response."""
+        self.coordinator.update_from_command(
+            await self.entity_description.setter(self._api, value)
         )
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        update_data = None
-        if self.entity_description.key == "auto_mode":
-            update_data = await self._api.set_auto_mode(True)
-        elif self.entity_description.key == "control_panel_lock":
-            update_data = await self._api.set_lock(True)
-        elif self.entity_description.key == "display_light":
-            update_data = await self._api.set_light_indicator(True)
-
-        if update_data is not None:
-            self.coordinator.update_from_command(update_data)
+        await self._async_set(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        update_data = None
-        if self.entity_description.key == "auto_mode":
-            update_data = await self._api.set_auto_mode(False)
-        elif self.entity_description.key == "control_panel_lock":
-            update_data = await self._api.set_lock(False)
-        elif self.entity_description.key == "display_light":
-            update_data = await self._api.set_light_indicator(False)
-
-        if update_data is not None:
-            self.coordinator.update_from_command(update_data)
-
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass."""
-        self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
-        )
+        await self._async_set(False)
 